@@ -2,11 +2,18 @@ import os
 import numpy as np
 import sys
 import threading
+from concurrent.futures import ThreadPoolExecutor, wait
 from PIL import Image, ImageDraw, ImageFont, ImageTk
 import tkinter as tk
 from tkinter import ttk, filedialog, messagebox, scrolledtext
 import tkinter.font as tkfont
 
+# 可选的OpenCV加速读取与缩放（未安装时回退到PIL）
+try:
+    import cv2
+except ImportError:
+    cv2 = None
+
 # 深色主题配色方案
 DARK_BG = "#EDF0F3"
 DARK_FG = "#6B6A6A"
@@ -17,14 +24,46 @@ BUTTON_HOVER = "#5E565D"
 SLIDER_COLOR = "#665A6200"
 TEXT_COLOR = "#FFFFFF"
 
+# 可选的numba并行内核：仅供作为库调用生成超大输出时使用（界面宽度最多500，不会达到该阈值），
+# 默认使用NumPy（导入约0.3秒、首次编译约1秒，常用尺寸下每次只能节省几百微秒）
+NUMBA_MIN_PIXELS = 4000000
+_numba_kernel = None
+
+def _get_numba_kernel():
+    """按需导入numba并编译字节渲染内核（未安装时返回None）"""
+    global _numba_kernel
+    if _numba_kernel is None:
+        try:
+            from numba import njit, prange
+        except ImportError:
+            _numba_kernel = False
+            return None
+        
+        @njit(parallel=True, cache=True)
+        def _render_ascii_bytes(indices, char_lut, out):
+            """按行并行将字符索引写入字节缓冲区（每行末尾为换行符）"""
+            height, width = indices.shape
+            for y in prange(height):
+                for x in range(width):
+                    out[y, x] = char_lut[indices[y, x]]
+                out[y, width] = 10
+        
+        _numba_kernel = _render_ascii_bytes
+    return _numba_kernel or None
+
 class AsciiArtGenerator:
     """高级ASCII艺术生成器"""
     
     # 默认字符集（从深到浅）
     ASCII_CHARS = "@$B%8&WM#*oahkbdpqwmZO0QLCJUYXzcvunxrjft/\|()1{}[]?-_+~<>i!lI;:,\"^`'. "
+    # 字符查找表（索引 -> ASCII字节）
+    ASCII_LUT = np.frombuffer(ASCII_CHARS.encode('ascii'), dtype=np.uint8)
     
     def __init__(self):
         self.font_cache = {}
+        self.lut_cache = {}
+        self.atlas_cache = {}
+        self.pixels_cache = {}
         self.default_font_paths = [
             '/System/Library/Fonts/Menlo.ttc',      # macOS
             '/usr/share/fonts/truetype/ubuntu/UbuntuMono-R.ttf',  # Ubuntu
@@ -33,50 +72,123 @@ class AsciiArtGenerator:
             'C:/Windows/Fonts/CascadiaMono.ttf'     # 清晰度更高的现代字体
         ]
     
-    def generate_ascii_art(self, image_path, output_width=200, contrast=1.2, gamma=0.8):
-        """生成ASCII艺术"""
+    def generate_ascii_art(self, image_path, output_width=200, contrast=1.2, gamma=0.8, fast_resize=False):
+        """生成ASCII艺术（返回字符索引矩阵、文本行列表与以换行符分隔的完整文本）"""
         try:
-            # 打开图片并转换为灰度
-            img = Image.open(image_path)
-            img = img.convert('L')
-            
-            # 应用对比度增强
-            img = np.array(img)
-            img = img.astype(np.float32)
-            img = (img - 128) * contrast + 128
-            img = np.clip(img, 0, 255).astype(np.uint8)
-            img = Image.fromarray(img)
+            # 读取灰度图片并缩放（缩放后再处理，减少数据量）
+            pixels = self._get_resized_pixels(image_path, output_width, fast_resize)
             
-            # 调整尺寸（保持宽高比）
-            width, height = img.size
-            aspect_ratio = height / width
-            # 考虑字符的高宽比（通常字符高度是宽度的2倍）
-            new_height = int(output_width * aspect_ratio * 0.5)
+            # 高精度灰度到字符映射（通过256级查找表一次完成）
+            indices = self._get_index_lut(contrast, gamma)[pixels]
             
-            # 高质量缩放
-            img = img.resize((output_width, new_height), Image.LANCZOS)
-            
-            # 获取像素数据
-            pixels = np.array(img)
-            
-            # 高精度灰度到字符映射
-            char_length = len(self.ASCII_CHARS)
-            # 将像素值映射到0-1范围
-            normalized = pixels.astype(np.float32) / 255.0
-            # 应用gamma校正增强细节
-            normalized = np.power(normalized, gamma)
-            # 映射到字符索引
-            indices = (normalized * (char_length - 1)).astype(np.int32)
-            
-            # 创建ASCII字符串
-            ascii_str = ''.join([self.ASCII_CHARS[i] for i in indices.flatten()])
+            # 超大输出时使用numba并行内核直接生成带换行符的字节缓冲区
+            kernel = _get_numba_kernel() if indices.size >= NUMBA_MIN_PIXELS else None
+            if kernel is not None:
+                out = np.empty((indices.shape[0], indices.shape[1] + 1), dtype=np.uint8)
+                kernel(indices, self.ASCII_LUT, out)
+                text = out.tobytes()[:-1].decode('ascii')
+            else:
+                # 通过查找表批量映射为带换行符的字节缓冲区
+                text = self._build_ascii_text(indices)
             
-            # 分割为行列表
-            return [ascii_str[i:i+output_width] for i in range(0, len(ascii_str), output_width)]
+            # 一次切分为行列表（完整文本一并返回，供预览直接截取）
+            return indices, text.split('\n'), text
         
         except Exception as e:
             raise RuntimeError(f"生成ASCII艺术失败: {str(e)}")
     
+    def _get_resized_pixels(self, image_path, output_width, fast_resize=False):
+        """获取缩放后的灰度像素矩阵（带缓存）"""
+        # 检查缓存：图片与输出宽度未变时（只调整对比度/gamma）跳过解码与缩放
+        cache_key = (image_path, os.path.getmtime(image_path), output_width, fast_resize)
+        if cache_key in self.pixels_cache:
+            return self.pixels_cache[cache_key]
+        
+        pixels = self._load_resized_pixels(image_path, output_width, fast_resize)
+        
+        # 只缓存最近一次的结果，避免拖动宽度滑块时占用过多内存
+        self.pixels_cache.clear()
+        self.pixels_cache[cache_key] = pixels
+        return pixels
+    
+    def _load_resized_pixels(self, image_path, output_width, fast_resize=False):
+        """读取灰度图片并缩放到输出宽度，返回uint8像素矩阵（默认PIL Lanczos，快速缩放时优先OpenCV）"""
+        # 快速缩放时优先使用OpenCV（SIMD加速，但结果与默认的PIL Lanczos不完全一致；
+        # 读取失败时回退到PIL，例如Windows下的中文路径）
+        if fast_resize and cv2 is not None:
+            # 按彩色读取再用cvtColor转灰度（与PIL的convert('L')相差不超过1级；
+            # 直接以灰度读取PNG时libpng的转换公式不同，最多相差32级）
+            pixels = cv2.imread(image_path, cv2.IMREAD_COLOR | cv2.IMREAD_IGNORE_ORIENTATION)
+            if pixels is not None:
+                pixels = cv2.cvtColor(pixels, cv2.COLOR_BGR2GRAY)
+                height, width = pixels.shape
+                new_height = self._output_height(width, height, output_width)
+                # 缩小用区域插值，放大用Lanczos插值。OpenCV的其他插值缩小时不做抗锯齿，
+                # 因此不沿用PIL的快速缩放阈值；两种后端的结果接近但不完全一致
+                interpolation = cv2.INTER_AREA if width >= output_width else cv2.INTER_LANCZOS4
+                return cv2.resize(pixels, (output_width, new_height), interpolation=interpolation)
+        
+        # 打开图片并转换为灰度
+        img = Image.open(image_path)
+        img = img.convert('L')
+        
+        # 调整尺寸（保持宽高比）
+        width, height = img.size
+        new_height = self._output_height(width, height, output_width)
+        
+        # 快速缩放（高级选项，未安装OpenCV时）：按缩小倍数换用更快的滤波器，画面会有可见变化
+        ratio = width / output_width
+        if not fast_resize or ratio < 4:
+            resample = Image.LANCZOS
+        elif ratio < 8:
+            resample = Image.BICUBIC
+        else:
+            resample = Image.BILINEAR
+        
+        # 高质量缩放
+        img = img.resize((output_width, new_height), resample)
+        
+        # 获取像素数据
+        return np.asarray(img)
+    
+    def _output_height(self, width, height, output_width):
+        """计算输出行数（保持宽高比）"""
+        aspect_ratio = height / width
+        # 考虑字符的高宽比（通常字符高度是宽度的2倍）
+        return int(output_width * aspect_ratio * 0.5)
+    
+    def _get_index_lut(self, contrast, gamma):
+        """获取灰度到字符索引的查找表（带缓存）"""
+        # 检查缓存
+        cache_key = (round(contrast, 3), round(gamma, 3))
+        if cache_key in self.lut_cache:
+            return self.lut_cache[cache_key]
+        
+        char_length = len(self.ASCII_CHARS)
+        # 对全部256个灰度级计算一次
+        levels = np.arange(256, dtype=np.float32)
+        # 应用对比度增强
+        levels = np.clip((levels - 128) * contrast + 128, 0, 255)
+        # 将像素值映射到0-1范围
+        levels = levels / 255.0
+        # 应用gamma校正增强细节
+        levels = np.power(levels, gamma)
+        # 映射到字符索引
+        lut = (levels * (char_length - 1)).astype(np.uint8)
+        
+        # 缓存查找表
+        self.lut_cache[cache_key] = lut
+        return lut
+    
+    def _build_ascii_text(self, indices):
+        """将字符索引矩阵转换为以换行符分隔的文本"""
+        rows, cols = indices.shape
+        # 每行末尾追加换行符，一次解码整块字节
+        buf = np.empty((rows, cols + 1), dtype=np.uint8)
+        buf[:, :cols] = self.ASCII_LUT[indices]
+        buf[:, cols] = 10
+        return buf.tobytes()[:-1].decode('ascii')
+    
     def save_ascii_text(self, ascii_lines, output_path):
         """保存为文本文件"""
         try:
@@ -86,41 +198,35 @@ class AsciiArtGenerator:
         except Exception as e:
             raise RuntimeError(f"保存文本文件失败: {str(e)}")
     
-    def save_ascii_image(self, ascii_lines, output_path, font_size=10, 
+    def save_ascii_image(self, indices, output_path, font_size=10, 
                          bg_color=(3, 3, 3), text_color=(255, 255, 255)):
         """保存为PNG图片"""
         try:
-            # 获取字体
-            font = self._get_font(font_size)
-            
-            # 计算字符尺寸
-            if hasattr(font, 'getsize'):
-                char_width, char_height = font.getsize("A")
-            else:
-                # 回退尺寸
-                char_width, char_height = 6, 12
+            # 获取字符尺寸与预渲染的字符图集
+            char_width, char_height, atlas = self._get_glyph_atlas(font_size)
             
             # 计算图片尺寸
-            img_width = char_width * len(ascii_lines[0])
-            img_height = char_height * len(ascii_lines)
+            rows, cols = indices.shape
+            img_width = char_width * cols
+            img_height = char_height * rows
             
-            # 创建高分辨率图片（使用RGB模式）
-            img = Image.new('RGB', (img_width, img_height), color=bg_color)
-            draw = ImageDraw.Draw(img)
+            # 从图集分块拷贝字形，拼成完整的灰度遮罩（每块保持在L2缓存内）
+            tile_rows, tile_cols = 32, 64
+            mask = np.empty((img_height, img_width), dtype=np.uint8)
+            for y0 in range(0, rows, tile_rows):
+                for x0 in range(0, cols, tile_cols):
+                    tile = indices[y0:y0 + tile_rows, x0:x0 + tile_cols]
+                    th, tw = tile.shape
+                    mask[y0 * char_height:(y0 + th) * char_height,
+                         x0 * char_width:(x0 + tw) * char_width] = \
+                        atlas[tile].transpose(0, 2, 1, 3).reshape(th * char_height, tw * char_width)
             
-            # 使用抗锯齿渲染
-            try:
-                if hasattr(ImageFont, 'FreeTypeFont'):
-                    # 使用FreeType渲染器（更清晰）
-                    draw.fontmode = "L"  # 抗锯齿
-            except Exception as e:
-                print(f"抗锯齿设置失败: {str(e)}")
-            
-            # 绘制ASCII字符（逐行渲染）
-            y = 0
-            for line in ascii_lines:
-                draw.text((0, y), line, fill=text_color, font=font)
-                y += char_height
+            # 按抗锯齿灰度在背景色与文字色之间混合（调色板模式，每像素1字节）
+            alpha = np.arange(256, dtype=np.float32)[:, None] / 255.0
+            palette = np.array(bg_color, dtype=np.float32) * (1 - alpha) + np.array(text_color, dtype=np.float32) * alpha
+            palette = np.round(palette).astype(np.uint8)
+            img = Image.fromarray(mask)
+            img.putpalette(palette.tobytes())
             
             # 保存为高质量PNG
             img.save(output_path, 'PNG', compress_level=1)
@@ -129,6 +235,45 @@ class AsciiArtGenerator:
         except Exception as e:
             raise RuntimeError(f"保存图片失败: {str(e)}")
     
+    def _get_glyph_atlas(self, font_size):
+        """获取字符尺寸与字符图集（带缓存）"""
+        # 检查缓存
+        cache_key = f"{font_size}"
+        if cache_key in self.atlas_cache:
+            return self.atlas_cache[cache_key]
+        
+        # 获取字体
+        font = self._get_font(font_size)
+        
+        # 计算字符尺寸（最宽字符的步进宽度 × 上升加下降高度，等宽字体即"A"的宽度）
+        if hasattr(font, 'getlength') and hasattr(font, 'getmetrics'):
+            char_width = max(1, max(round(font.getlength(c)) for c in self.ASCII_CHARS))
+            char_height = sum(font.getmetrics())
+        elif hasattr(font, 'getsize'):
+            # 旧版Pillow（10.0之前）
+            char_width, char_height = font.getsize("A")
+        else:
+            # 回退尺寸
+            char_width, char_height = 6, 12
+        
+        # 预渲染字符图集
+        atlas = self._build_glyph_atlas(font, char_width, char_height)
+        
+        # 缓存尺寸与图集
+        self.atlas_cache[cache_key] = (char_width, char_height, atlas)
+        return self.atlas_cache[cache_key]
+    
+    def _build_glyph_atlas(self, font, char_width, char_height):
+        """预渲染字符图集（每个字符一个灰度单元格）"""
+        atlas = np.zeros((len(self.ASCII_CHARS), char_height, char_width), dtype=np.uint8)
+        for i, char in enumerate(self.ASCII_CHARS):
+            glyph = Image.new('L', (char_width, char_height), 0)
+            draw = ImageDraw.Draw(glyph)
+            draw.fontmode = "L"  # 抗锯齿
+            draw.text((0, 0), char, fill=255, font=font)
+            atlas[i] = np.asarray(glyph)
+        return atlas
+    
     def _get_font(self, font_size):
         """获取字体对象（带缓存）"""
         # 检查缓存
@@ -159,9 +304,12 @@ class AsciiArtGenerator:
                     except:
                         continue
             
-            # 最终回退
+            # 最终回退（Pillow 10.1起默认字体支持指定大小）
             if font is None:
-                font = ImageFont.load_default()
+                try:
+                    font = ImageFont.load_default(font_size)
+                except TypeError:
+                    font = ImageFont.load_default()
             
             # 缓存字体
             self.font_cache[cache_key] = font
@@ -193,6 +341,8 @@ class AsciiArtUI(tk.Tk):
         self.geometry("900x700")
         self.resizable(True, True)
         self.generator = AsciiArtGenerator()
+        # 文件保存线程池（文本与PNG并行写出）
+        self.io_executor = ThreadPoolExecutor(max_workers=2)
         
         # 设置应用图标
         try:
@@ -328,6 +478,9 @@ class AsciiArtUI(tk.Tk):
         left_panel = ttk.LabelFrame(main_frame, text="设置", padding=15)
         left_panel.pack(side=tk.LEFT, fill=tk.BOTH, expand=True, padx=5, pady=5)
         
+        # 按钮引用（生成期间统一禁用）
+        self.buttons = []
+        
         # 输入部分
         input_frame = ttk.Frame(left_panel)
         input_frame.pack(fill=tk.X, pady=5)
@@ -336,7 +489,9 @@ class AsciiArtUI(tk.Tk):
         self.input_path = tk.StringVar()
         input_entry = ttk.Entry(input_frame, textvariable=self.input_path, width=40)
         input_entry.pack(side=tk.LEFT, fill=tk.X, expand=True, padx=(0, 5))
-        ModernButton(input_frame, text="浏览...", command=self.browse_image).pack(side=tk.LEFT)
+        button = ModernButton(input_frame, text="浏览...", command=self.browse_image)
+        button.pack(side=tk.LEFT)
+        self.buttons.append(button)
         
         # 输出目录
         output_frame = ttk.Frame(left_panel)
@@ -346,7 +501,9 @@ class AsciiArtUI(tk.Tk):
         self.output_dir = tk.StringVar()
         output_entry = ttk.Entry(output_frame, textvariable=self.output_dir, width=40)
         output_entry.pack(side=tk.LEFT, fill=tk.X, expand=True, padx=(0, 5))
-        ModernButton(output_frame, text="浏览...", command=self.browse_output).pack(side=tk.LEFT)
+        button = ModernButton(output_frame, text="浏览...", command=self.browse_output)
+        button.pack(side=tk.LEFT)
+        self.buttons.append(button)
         
         # 参数控制
         params_frame = ttk.Frame(left_panel)
@@ -422,13 +579,19 @@ class AsciiArtUI(tk.Tk):
         self.save_image_var = tk.IntVar(value=1)
         ttk.Checkbutton(options_inner, text="保存PNG图片", variable=self.save_image_var).pack(side=tk.LEFT, padx=10, pady=5)
         
+        self.fast_resize_var = tk.IntVar(value=0)
+        ttk.Checkbutton(options_inner, text="快速缩放", variable=self.fast_resize_var).pack(side=tk.LEFT, padx=10, pady=5)
+        
         # 按钮区域
         button_frame = ttk.Frame(left_panel)
         button_frame.pack(fill=tk.X, pady=10)
         
-        ModernButton(button_frame, text="开始生成", command=self.start_generation).pack(side=tk.LEFT, padx=5, fill=tk.X, expand=True)
-        ModernButton(button_frame, text="打开输出目录", command=self.open_output_dir).pack(side=tk.LEFT, padx=5, fill=tk.X, expand=True)
-        ModernButton(button_frame, text="退出", command=self.on_close).pack(side=tk.LEFT, padx=5, fill=tk.X, expand=True)
+        for text, command in (("开始生成", self.start_generation),
+                              ("打开输出目录", self.open_output_dir),
+                              ("退出", self.on_close)):
+            button = ModernButton(button_frame, text=text, command=command)
+            button.pack(side=tk.LEFT, padx=5, fill=tk.X, expand=True)
+            self.buttons.append(button)
         
         # 状态栏
         status_frame = ttk.Frame(left_panel)
@@ -456,7 +619,12 @@ class AsciiArtUI(tk.Tk):
                 height=30,
                 bg=HIGHLIGHT_COLOR,
                 fg=TEXT_COLOR,
-                insertbackground=TEXT_COLOR
+                insertbackground=TEXT_COLOR,
+                # 只读预览：关闭撤销记录，减少大段插入时的开销
+                undo=False,
+                maxundo=0,
+                autoseparators=False,
+                state=tk.DISABLED
             )
 
         self.preview_text.pack(fill=tk.BOTH, expand=True)
@@ -502,26 +670,45 @@ class AsciiArtUI(tk.Tk):
             return
         
         # 禁用按钮防止重复点击
-        for widget in self.winfo_children():
-            if isinstance(widget, (ttk.Button, ModernButton)):
-                widget.config(state=tk.DISABLED)
+        for button in self.buttons:
+            button.config(state=tk.DISABLED)
         
         # 更新状态
         self.status_var.set("处理中...")
         
+        # 在Tk主线程读取全部参数，后台线程不再访问Tk变量
+        params = {
+            "input_path": input_path,
+            "output_dir": self.output_dir.get(),
+            "output_width": self.width_var.get(),
+            "contrast": self.contrast_var.get(),
+            "gamma": self.gamma_var.get(),
+            "fast_resize": self.fast_resize_var.get() == 1,
+            "font_size": self.font_size_var.get(),
+            "preview": self.preview_var.get() == 1,
+            "save_text": self.save_text_var.get() == 1,
+            "save_image": self.save_image_var.get() == 1,
+        }
+        
+        # 清空预览（与后台解码图片同时进行）
+        if params["preview"]:
+            self.preview_text.config(state=tk.NORMAL)
+            self.preview_text.delete(1.0, tk.END)
+            self.preview_text.config(state=tk.DISABLED)
+        
         # 在后台线程中运行生成过程
-        threading.Thread(target=self.generate_ascii, daemon=True).start()
+        threading.Thread(target=self.generate_ascii, args=(params,), daemon=True).start()
     
-    def generate_ascii(self):
+    def generate_ascii(self, params):
         """生成ascciArt的核心方法"""
         try:
             # 获取输入参数
-            input_path = self.input_path.get()
-            output_dir = self.output_dir.get()
+            input_path = params["input_path"]
+            output_dir = params["output_dir"]
             
             # 验证输入
             if not input_path or not os.path.exists(input_path):
-                self.status_var.set("请选择有效的图片文件!")
+                self.after(0, self.status_var.set, "请选择有效的图片文件!")
                 return
             
             if not os.path.exists(output_dir):
@@ -533,50 +720,75 @@ class AsciiArtUI(tk.Tk):
             png_path = os.path.join(output_dir, f"{base_name}_ascii.png")
             
             # 生成ASCII艺术
-            ascii_lines = self.generator.generate_ascii_art(
+            indices, ascii_lines, ascii_text = self.generator.generate_ascii_art(
                 input_path,
-                output_width=self.width_var.get(),
-                contrast=self.contrast_var.get(),
-                gamma=self.gamma_var.get()
+                output_width=params["output_width"],
+                contrast=params["contrast"],
+                gamma=params["gamma"],
+                fast_resize=params["fast_resize"]
             )
             
-            # 显示预览
-            if self.preview_var.get() == 1:
-                # 只显示前100行以避免界面卡顿
-                preview_text = '\n'.join(ascii_lines[:100])
-                self.preview_text.config(state=tk.NORMAL)
-                self.preview_text.delete(1.0, tk.END)
-                self.preview_text.insert(tk.END, preview_text)
-                self.preview_text.config(state=tk.DISABLED)
+            # 显示预览（文本在后台线程构建，交由Tk主线程更新界面）
+            if params["preview"]:
+                preview_text = self._get_preview_text(ascii_text, indices.shape)
+                self.after(0, self.show_preview, preview_text)
+            
+            futures = []
             
             # 保存文本文件
-            if self.save_text_var.get() == 1:
-                self.generator.save_ascii_text(ascii_lines, txt_path)
+            if params["save_text"]:
+                futures.append(self.io_executor.submit(
+                    self.generator.save_ascii_text, ascii_lines, txt_path))
             
-            # 保存PNG图片
-            if self.save_image_var.get() == 1:
-                self.generator.save_ascii_image(
-                    ascii_lines,
+            # 保存PNG图片（与文本文件同时写出）
+            if params["save_image"]:
+                futures.append(self.io_executor.submit(
+                    self.generator.save_ascii_image,
+                    indices,
                     png_path,
-                    font_size=self.font_size_var.get(),
+                    font_size=params["font_size"],
                     bg_color=(3, 3, 3),
                     text_color=(255, 255, 255)
-                )
+                ))
             
-            self.status_var.set(f"完成! 输出到: {output_dir}")
+            # 等待全部保存完成，并抛出其中的异常
+            wait(futures)
+            for future in futures:
+                future.result()
+            
+            self.after(0, self.status_var.set, f"完成! 输出到: {output_dir}")
         
         except Exception as e:
-            self.status_var.set(f"错误: {str(e)}")
-            messagebox.showerror("错误", str(e))
+            self.after(0, self.status_var.set, f"错误: {str(e)}")
+            self.after(0, messagebox.showerror, "错误", str(e))
         finally:
             # 重新启用按钮
-            for widget in self.winfo_children():
-                if isinstance(widget, (ttk.Button, ModernButton)):
-                    widget.config(state=tk.NORMAL)
+            self.after(0, self.enable_buttons)
+    
+    def _get_preview_text(self, ascii_text, shape, max_lines=100):
+        """截取预览文本（只显示前100行以避免界面卡顿，直接切片整块文本，不再拼接）"""
+        rows, cols = shape
+        return ascii_text[:min(rows, max_lines) * (cols + 1) - 1]
+    
+    def show_preview(self, preview_text):
+        """在预览区显示ASCII艺术"""
+        self.preview_text.config(state=tk.NORMAL)
+        self.preview_text.delete(1.0, tk.END)
+        # 从开头插入并停留在顶部，避免插入光标跟随带来的滚动重排
+        self.preview_text.insert('1.0', preview_text)
+        self.preview_text.mark_set(tk.INSERT, '1.0')
+        self.preview_text.see('1.0')
+        self.preview_text.config(state=tk.DISABLED)
+    
+    def enable_buttons(self):
+        """重新启用按钮"""
+        for button in self.buttons:
+            button.config(state=tk.NORMAL)
     
     def on_close(self):
         """关闭窗口前的清理工作"""
         if messagebox.askokcancel("退出", "确定要退出程序吗?"):
+            self.io_executor.shutdown(wait=False)
             self.destroy()
 
 
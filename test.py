@@ -11,13 +11,6 @@ def high_precision_image_to_ascii(image_path, output_width=200, contrast=1.2, ga
     img = Image.open(image_path)
     img = img.convert('L')  # 转换为灰度图
     
-    # 应用对比度增强
-    img = np.array(img)
-    img = img.astype(np.float32)
-    img = (img - 128) * contrast + 128
-    img = np.clip(img, 0, 255).astype(np.uint8)
-    img = Image.fromarray(img)
-    
     # 调整尺寸（保持宽高比）
     width, height = img.size
     aspect_ratio = height / width
@@ -28,22 +21,25 @@ def high_precision_image_to_ascii(image_path, output_width=200, contrast=1.2, ga
     img = img.resize((output_width, new_height), Image.LANCZOS)  # lanczos算法提高细腻程度
     
     # 获取像素数据
-    pixels = np.array(img)
+    pixels = np.asarray(img)
     
-    # 高精度灰度到字符映射
+    # 高精度灰度到字符映射（对比度与gamma合并为256级查找表，缩放后再应用）
     char_length = len(ASCII_CHARS)
+    levels = np.arange(256, dtype=np.float32)
+    # 应用对比度增强
+    levels = np.clip((levels - 128) * contrast + 128, 0, 255)
     # 将像素值映射到0-1范围
-    normalized = pixels.astype(np.float32) / 255.0
+    levels = levels / 255.0
     # 应用gamma校正增强细节
-    normalized = np.power(normalized, gamma)
-    # 映射到字符索引
-    indices = (normalized * (char_length - 1)).astype(np.int32)
+    levels = np.power(levels, gamma)
+    # 映射到字符索引（全程保持uint8，每像素1字节）
+    indices = (levels * (char_length - 1)).astype(np.uint8)[pixels]
     
-    # 创建ASCII字符串
-    ascii_str = ''.join([ASCII_CHARS[i] for i in indices.flatten()])
+    # 通过字节查找表批量映射为字符
+    chars = np.frombuffer(ASCII_CHARS.encode('ascii'), dtype=np.uint8)[indices]
     
-    # 分割为行列表
-    return [ascii_str[i:i+output_width] for i in range(0, len(ascii_str), output_width)]
+    # 按行解码为字符串列表
+    return [row.tobytes().decode('ascii') for row in chars]
 
 def save_high_res_ascii(ascii_lines, output_path, font_size=8, bg_color=(0, 0, 0), text_color=(255, 255, 255)):
     """将 ASCII 字符画保存为高分辨率 PNG 图片"""